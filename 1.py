@@ -1,5 +1,9 @@
+import os
+
 import streamlit as st
 import pandas as pd
+import numpy as np
+import altair as alt
 
 # =================================================
 # PAGE CONFIG
@@ -63,41 +67,211 @@ st.markdown("""
 # =================================================
 # LOAD DATA
 # =================================================
-@st.cache_data
-def load_data():
-    df = pd.read_csv("social_media_engagement_enhanced (1).csv")
-    df["date"] = pd.to_datetime(df["date"])
+CSV_PATH = "social_media_engagement_enhanced (1).csv"
+PARQUET_PATH = "social_media_engagement_enhanced.parquet"
+
+def rebuild_parquet():
+    df = pd.read_csv(CSV_PATH, engine="pyarrow", parse_dates=["date"])
+    # Write to a temp file and swap it in, so a failed or interrupted write
+    # never leaves a truncated copy at PARQUET_PATH.
+    tmp_path = f"{PARQUET_PATH}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+        os.replace(tmp_path, PARQUET_PATH)
+    except OSError:
+        # Read-only dir / disk full: serve the parsed CSV without a copy
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
     return df
 
-df = load_data()
+def read_source():
+    # One-time CSV -> Parquet conversion; rebuilt whenever the CSV is newer
+    # or the existing copy can't be read.
+    if (
+        not os.path.exists(PARQUET_PATH)
+        or os.path.getmtime(PARQUET_PATH) < os.path.getmtime(CSV_PATH)
+    ):
+        return rebuild_parquet()
+    try:
+        return pd.read_parquet(PARQUET_PATH, engine="pyarrow")
+    except (OSError, ValueError):
+        return rebuild_parquet()
+
+@st.cache_data
+def load_data():
+    df = read_source()
+    df["platform"] = df["platform"].astype("category")
+    df["content_type"] = df["content_type"].astype("category")
+    df["campaign_name"] = df["campaign_name"].astype("category")
+    df["year"] = df["year"].astype("int16")
+    df["month"] = df["month"].astype("int8")
+    df["post_hour"] = df["post_hour"].astype("int8")
+
+    # DERIVED METRICS
+    ad = df["ad_spend"].to_numpy(dtype="float64")
+    roi = df["roi"].to_numpy(dtype="float64")
+    df["revenue_generated"] = ad + ad * roi
+
+    # Narrow the integer counts to int32. The float columns stay float64 so
+    # the tables and the CSV export keep the source values exactly.
+    for c in ("followers", "likes", "comments", "shares", "impressions", "reach", "engagement", "ad_spend"):
+        df[c] = df[c].astype("int32")
+
+    # Physically group rows by the common groupby keys; the filter mask keeps
+    # this order, so platform/content_type groups arrive as contiguous runs.
+    # The index keeps each row's source position so exports can restore it.
+    return df.sort_values(["platform", "content_type", "date"], kind="stable")
 
 # =================================================
-# DERIVED METRICS
+# CACHED FILTER + AGGREGATIONS
+# (keyed on sorted filter tuples, so repeated selections are lookups)
 # =================================================
-df["revenue_generated"] = df["ad_spend"] * (1 + df["roi"])
+@st.cache_data
+def filter_options():
+    df = load_data()
+    return (
+        df["platform"].cat.categories.tolist(),
+        df["content_type"].cat.categories.tolist(),
+        sorted(df["year"].unique().tolist()),
+    )
+
+# Code arrays, masks and the KPI block are cached as shared in-process
+# resources: a hit returns the same (read-only) ndarray instead of unpickling a fresh copy
+# the way st.cache_data does.
+@st.cache_resource
+def filter_codes():
+    df = load_data()
+    codes = (
+        df["platform"].cat.codes.to_numpy(),
+        df["content_type"].cat.codes.to_numpy(),
+        df["year"].to_numpy(),
+    )
+    for arr in codes:
+        arr.flags.writeable = False
+    return codes
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def filter_mask(platforms, contents, years):
+    all_platforms, all_contents, _ = filter_options()
+    p_codes, c_codes, y_vals = filter_codes()
+
+    mask = np.isin(p_codes, pd.Index(all_platforms).get_indexer(platforms))
+    mask &= np.isin(c_codes, pd.Index(all_contents).get_indexer(contents))
+    mask &= np.isin(y_vals, np.asarray(years, dtype=y_vals.dtype))
+    mask.flags.writeable = False
+    return mask
+
+@st.cache_data(show_spinner=False)
+def get_filtered(platforms, contents, years):
+    return load_data()[filter_mask(platforms, contents, years)]
+
+# One platform x content_type pass holding sums + row counts; the
+# per-platform and per-content means are rolled up from it (sum / n),
+# so averages stay exact instead of being means of means.
+@st.cache_data(show_spinner=False)
+def build_cube(platforms, contents, years):
+    fdf = get_filtered(platforms, contents, years)
+    return fdf.groupby(["platform", "content_type"], observed=True, sort=False).agg(
+        n=("engagement", "size"),
+        engagement_rate=("engagement_rate", "sum"),
+        engagement=("engagement", "sum"),
+        likes=("likes", "sum"),
+        comments=("comments", "sum"),
+        shares=("shares", "sum"),
+    )
+
+def cube_mean(cube, level, cols):
+    rolled = cube.groupby(level=level, observed=True)[["n", *cols]].sum()
+    return rolled[cols].div(rolled["n"], axis=0)
+
+@st.cache_data(show_spinner=False)
+def agg_content_er(platforms, contents, years):
+    cube = build_cube(platforms, contents, years)
+    return cube_mean(cube, "content_type", ["engagement_rate"]).reset_index()
+
+@st.cache_data(show_spinner=False)
+def agg_platform_er(platforms, contents, years):
+    cube = build_cube(platforms, contents, years)
+    return cube_mean(cube, "platform", ["engagement_rate"]).reset_index()
+
+@st.cache_data(show_spinner=False)
+def agg_content(platforms, contents, years):
+    cube = build_cube(platforms, contents, years)
+    return cube_mean(cube, "content_type", ["likes","comments","shares","engagement"]).reset_index()
+
+KPI_COLS = ["engagement", "engagement_rate", "ad_spend", "revenue_generated", "roi"]
+
+@st.cache_resource
+def kpi_arrays():
+    # One contiguous row per KPI column, so each reduction is a unit-stride scan
+    arr = np.ascontiguousarray(load_data()[KPI_COLS].to_numpy(dtype="float64").T)
+    arr.flags.writeable = False
+    return arr
+
+@st.cache_data(show_spinner=False)
+def kpis(platforms, contents, years):
+    # Single 2-D pass over the masked raw block for all five cards; no
+    # filtered DataFrame or per-column Series is built on this path.
+    arr = kpi_arrays()[:, filter_mask(platforms, contents, years)]
+    n = arr.shape[1]
+    sums = arr.sum(axis=1)
+    means = sums / n if n else np.full(sums.shape, np.nan)
+    return {
+        "total_engagement": int(round(sums[0])),
+        "avg_engagement_rate": round(float(means[1]), 2),
+        "ad_spend": int(round(sums[2])),
+        "revenue_generated": int(round(sums[3])),
+        "avg_roi": round(float(means[4]), 2),
+    }
+
+@st.cache_data(show_spinner=False)
+def agg_campaign(platforms, contents, years):
+    fdf = get_filtered(platforms, contents, years)
+    # groupby already drops rows with no campaign (dropna=True)
+    return fdf.groupby("campaign_name", as_index=False, observed=True)[["ad_spend","revenue_generated","roi"]].mean()
+
+@st.cache_data(show_spinner=False)
+def agg_hourly(platforms, contents, years):
+    fdf = get_filtered(platforms, contents, years)
+    return fdf.groupby("post_hour", as_index=False, observed=True)["engagement"].mean()
+
+@st.cache_data(show_spinner=False)
+def agg_trend(platforms, contents, years):
+    fdf = get_filtered(platforms, contents, years)
+    return fdf.groupby(["year", "month"], as_index=False, observed=True)["engagement"].mean()
+
+# Label of the row with the largest `key`, read off the raw arrays
+# (no label-based .loc/.idxmax lookup on these few-row frames)
+def argmax_row(frame, key, out):
+    i = int(frame[key].to_numpy().argmax())
+    return frame[out].to_numpy()[i]
 
 # =================================================
 # SIDEBAR FILTERS
 # =================================================
 st.sidebar.markdown("## 🎛️ Dashboard Controls")
 
+platforms, contents, years = filter_options()
+
 platform_filter = st.sidebar.multiselect(
-    "📱 Platform", df["platform"].unique(), df["platform"].unique()
+    "📱 Platform", platforms, platforms
 )
 
 content_filter = st.sidebar.multiselect(
-    "🖼️ Content Type", df["content_type"].unique(), df["content_type"].unique()
+    "🖼️ Content Type", contents, contents
 )
 
 year_filter = st.sidebar.multiselect(
-    "📅 Year", df["year"].unique(), df["year"].unique()
+    "📅 Year", years, years
+)
+
+selection = (
+    tuple(sorted(platform_filter)),
+    tuple(sorted(content_filter)),
+    tuple(sorted(year_filter)),
 )
 
-filtered_df = df[
-    (df["platform"].isin(platform_filter)) &
-    (df["content_type"].isin(content_filter)) &
-    (df["year"].isin(year_filter))
-]
+filtered_df = get_filtered(*selection)
 
 # =================================================
 # HEADER
@@ -123,96 +297,98 @@ st.info(
     """
 )
 
+# Nothing selected (or no matching rows): stop before any aggregation
+# or chart work instead of rendering empty/NaN views.
+if filtered_df.empty:
+    st.warning("⚠️ No posts match the current selection. Select at least one value per filter.")
+    st.stop()
+
 # =================================================
 # KPI CARDS
 # =================================================
-c1, c2, c3, c4, c5 = st.columns(5)
-
-c1.markdown(f"""
-<div class="metric-card blue">
-<h3>Total Engagement</h3>
-<h2>{int(filtered_df["engagement"].sum())}</h2>
+def kpi_card(col, color, title, value):
+    col.markdown(f"""
+<div class="metric-card {color}">
+<h3>{title}</h3>
+<h2>{value}</h2>
 </div>
 """, unsafe_allow_html=True)
 
-c2.markdown(f"""
-<div class="metric-card green">
-<h3>Avg Engagement Rate</h3>
-<h2>{round(filtered_df["engagement_rate"].mean(),2)}%</h2>
-</div>
-""", unsafe_allow_html=True)
+kpi = kpis(*selection)
 
-c3.markdown(f"""
-<div class="metric-card orange">
-<h3>Ad Spend</h3>
-<h2>₹ {int(filtered_df["ad_spend"].sum())}</h2>
-</div>
-""", unsafe_allow_html=True)
-
-c4.markdown(f"""
-<div class="metric-card red">
-<h3>Revenue Generated</h3>
-<h2>₹ {int(filtered_df["revenue_generated"].sum())}</h2>
-</div>
-""", unsafe_allow_html=True)
+c1, c2, c3, c4, c5 = st.columns(5)
 
-c5.markdown(f"""
-<div class="metric-card purple">
-<h3>Avg ROI</h3>
-<h2>{round(filtered_df["roi"].mean(),2)}</h2>
-</div>
-""", unsafe_allow_html=True)
+kpi_card(c1, "blue", "Total Engagement", kpi["total_engagement"])
+kpi_card(c2, "green", "Avg Engagement Rate", f"{kpi['avg_engagement_rate']}%")
+kpi_card(c3, "orange", "Ad Spend", f"₹ {kpi['ad_spend']}")
+kpi_card(c4, "red", "Revenue Generated", f"₹ {kpi['revenue_generated']}")
+kpi_card(c5, "purple", "Avg ROI", kpi["avg_roi"])
 
 st.markdown('<div class="progress-bar"></div>', unsafe_allow_html=True)
 
 # =================================================
 # TOP CONTENT INSIGHT
 # =================================================
-top_content = (
-    filtered_df.groupby("content_type")["engagement_rate"]
-    .mean()
-    .idxmax()
-)
+top_content = argmax_row(agg_content_er(*selection), "engagement_rate", "content_type")
 
 st.success(f"🔥 Best Performing Content Type: **{top_content}**")
 
+platform_eng = agg_platform_er(*selection)
+best_platform = argmax_row(platform_eng, "engagement_rate", "platform")
+
 # =================================================
-# TABS (ONE EXTRA TAB ADDED)
+# VIEWS (ONE EXTRA VIEW ADDED)
+# st.tabs runs every tab body on each rerun; a radio only renders
+# (and aggregates) the view that is actually on screen.
 # =================================================
-tab1, tab2, tab3, tab4, tab5 = st.tabs(
-    ["📱 Engagement", "🖼️ Content", "💰 Campaign ROI", "⏰ Best Time", "📈 Trends"]
+view = st.radio(
+    "View",
+    ["📱 Engagement", "🖼️ Content", "💰 Campaign ROI", "⏰ Best Time", "📈 Trends"],
+    horizontal=True,
+    key="view",
+    label_visibility="collapsed"
 )
 
 # ---------------- TAB 1 ----------------
-with tab1:
-    platform_eng = filtered_df.groupby("platform")["engagement_rate"].mean().reset_index()
-    st.bar_chart(platform_eng, x="platform", y="engagement_rate")
+if view == "📱 Engagement":
+    st.altair_chart(
+        alt.Chart(platform_eng).mark_bar().encode(x="platform:N", y="engagement_rate:Q"),
+        width="stretch"
+    )
 
-    best_platform = platform_eng.loc[
-        platform_eng["engagement_rate"].idxmax(), "platform"
-    ]
     st.info(f"📈 Highest engagement is observed on **{best_platform}**")
 
 # ---------------- TAB 2 ----------------
-with tab2:
-    content_perf = filtered_df.groupby("content_type")[["likes","comments","shares","engagement"]].mean().reset_index()
+elif view == "🖼️ Content":
+    content_perf = agg_content(*selection)
     st.dataframe(content_perf)
-    st.bar_chart(content_perf, x="content_type", y="engagement")
+    st.altair_chart(
+        alt.Chart(content_perf).mark_bar().encode(x="content_type:N", y="engagement:Q"),
+        width="stretch"
+    )
 
 # ---------------- TAB 3 ----------------
-with tab3:
-    campaign_df = filtered_df[filtered_df["campaign_name"].notna()]
-    campaign_summary = campaign_df.groupby("campaign_name")[["ad_spend","revenue_generated","roi"]].mean().reset_index()
+elif view == "💰 Campaign ROI":
+    campaign_summary = agg_campaign(*selection)
     st.dataframe(campaign_summary)
-    st.bar_chart(campaign_summary, x="campaign_name", y="revenue_generated")
-    st.bar_chart(campaign_summary, x="campaign_name", y="roi")
+    st.altair_chart(
+        alt.Chart(campaign_summary).mark_bar().encode(x="campaign_name:N", y="revenue_generated:Q"),
+        width="stretch"
+    )
+    st.altair_chart(
+        alt.Chart(campaign_summary).mark_bar().encode(x="campaign_name:N", y="roi:Q"),
+        width="stretch"
+    )
 
 # ---------------- TAB 4 ----------------
-with tab4:
-    hourly = filtered_df.groupby("post_hour")["engagement"].mean().reset_index()
-    st.line_chart(hourly, x="post_hour", y="engagement")
+elif view == "⏰ Best Time":
+    hourly = agg_hourly(*selection)
+    st.altair_chart(
+        alt.Chart(hourly).mark_line().encode(x="post_hour:Q", y="engagement:Q"),
+        width="stretch"
+    )
 
-    best_hour = hourly.loc[hourly["engagement"].idxmax(), "post_hour"]
+    best_hour = argmax_row(hourly, "engagement", "post_hour")
     st.success(f"🔥 Best Posting Time: **{best_hour}:00 hrs**")
 
     st.warning(
@@ -225,21 +401,17 @@ with tab4:
     )
 
 # ---------------- TAB 5 : TRENDS ----------------
-with tab5:
+elif view == "📈 Trends":
     st.markdown("### 📈 Engagement Trend Over Time")
 
-    trend_df = (
-        filtered_df.groupby(["year", "month"])["engagement"]
-        .mean()
-        .reset_index()
-        .sort_values(["year", "month"])
-    )
+    trend_df = agg_trend(*selection)
 
-    st.line_chart(trend_df, x="month", y="engagement")
+    st.altair_chart(
+        alt.Chart(trend_df).mark_line().encode(x="month:Q", y="engagement:Q"),
+        width="stretch"
+    )
 
-    best_month = trend_df.loc[
-        trend_df["engagement"].idxmax(), "month"
-    ]
+    best_month = argmax_row(trend_df, "engagement", "month")
 
     st.info(f"📊 Highest average engagement observed in **Month {best_month}**")
 
@@ -248,7 +420,7 @@ with tab5:
 # =================================================
 st.download_button(
     "⬇️ Download Filtered Data",
-    filtered_df.to_csv(index=False),
+    filtered_df.sort_index().to_csv(index=False),
     "filtered_social_media_data.csv",
     "text/csv"
 )